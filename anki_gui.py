@@ -2,21 +2,40 @@ import tkinter as tk
 from tkinter import messagebox, simpledialog 
 from PIL import Image, ImageTk
 import os
+import re
+import sys
 import json
+import orjson
+import csv
+import queue
 import threading
 import time
+import random
 import requests
+import httpx
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import asyncio
 import concurrent.futures
 import shutil
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
-from openai import OpenAI, BadRequestError
+from openai import OpenAI, AsyncOpenAI, BadRequestError, DefaultAsyncHttpxClient
 from dotenv import load_dotenv
 from google import genai
 from google.genai import types
+from google.genai import errors as genai_errors
 import azure.cognitiveservices.speech as speechsdk
 import base64
+import hashlib
+import sqlite3
+from collections import ChainMap, OrderedDict
 import fal_client
+try:
+    import h2  # Optional (pip install "httpx[http2]"): lets the httpx clients multiplex over HTTP/2
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
 
 # --- 1. CONFIGURATION LOADING ---
 load_dotenv()
@@ -46,48 +65,70 @@ DEFAULT_CONFIG = {
     "paths": {
         "anki_media_folder": r"C:\Users\tutin\AppData\Roaming\Anki2\User 1\collection.media",
         "temp_folder": "temp_images",
-        "output_csv": "ready_for_anki.csv"
+        "output_csv": "ready_for_anki.csv",
+        "cache_folder": "cache"
     },
     "app_settings": {
         "sheet_name": "Anki_Inbox",
         "batch_limit": 50,
-        "max_workers": 3
+        "max_workers": 3,
+        "gemini_rpm": 15,
+        "image_rpm": 50
     }
 }
 
 def load_config():
+    user_config = {}
     if not os.path.exists(CONFIG_FILE):
         print(f"⚠️ {CONFIG_FILE} not found. Using defaults.")
-        return DEFAULT_CONFIG
-    try:
-        with open(CONFIG_FILE, "r") as f:
-            user_config = json.load(f)
-            # Merge with defaults
-            for section, keys in DEFAULT_CONFIG.items():
-                if section not in user_config:
-                    user_config[section] = keys
-                else:
-                    for k, v in keys.items():
-                        if k not in user_config[section]:
-                            user_config[section][k] = v
-            return user_config
-    except Exception as e:
-        print(f"❌ Error reading config.json: {e}")
-        return DEFAULT_CONFIG
+    else:
+        try:
+            with open(CONFIG_FILE, "rb") as f:
+                user_config = orjson.loads(f.read())
+        except Exception as e:
+            print(f"❌ Error reading config.json: {e}")
+    # Merge with defaults: user values win per key; always fresh dicts, never DEFAULT_CONFIG itself
+    return {
+        section: dict(ChainMap(user_config.get(section) or {}, defaults))
+        for section, defaults in DEFAULT_CONFIG.items()
+    }
 
 CFG = load_config()
 
 # INITIALIZE CLIENTS
 google_client = genai.Client(api_key=GOOGLE_API_KEY)
 openai_client = OpenAI(api_key=OPENAI_API_KEY)
+# One shared pool for every image call (HTTP/2 when h2 is installed); the SDK defaults
+# (timeouts, redirects) are kept
+openai_async = AsyncOpenAI(
+    api_key=OPENAI_API_KEY,
+    http_client=DefaultAsyncHttpxClient(
+        http2=HTTP2,
+        limits=httpx.Limits(max_connections=10, max_keepalive_connections=10)
+    )
+)
 
 # SHORTCUT VARIABLES
 FINAL_FOLDER = CFG["paths"]["anki_media_folder"]
 TEMP_FOLDER = CFG["paths"]["temp_folder"]
 CSV_FILE = CFG["paths"]["output_csv"]
+CACHE_FOLDER = CFG["paths"]["cache_folder"]
 SHEET_NAME = CFG["app_settings"]["sheet_name"]
 BATCH_LIMIT = CFG["app_settings"]["batch_limit"]
 MAX_WORKERS = CFG["app_settings"]["max_workers"]
+GEMINI_RPM = CFG["app_settings"]["gemini_rpm"]
+IMAGE_RPM = CFG["app_settings"]["image_rpm"]
+
+# Shared keep-alive pool for image downloads/uploads instead of a new TLS handshake per call.
+# Auth headers stay per-request: this session also fetches from third-party CDNs.
+http_session = requests.Session()
+http_session.mount("https://", HTTPAdapter(
+    pool_connections=MAX_WORKERS,
+    pool_maxsize=MAX_WORKERS * 2,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=["GET", "POST"])
+))
+HTTP_TIMEOUT = (5, 60)  # (connect, read) seconds
 TARGET_LANGUAGE = CFG["generation"]["target_language"]
 IMG_QUALITY = CFG["generation"]["image_quality"]
 CEFR_LVL = CFG["generation"]["cefr_lvl"]
@@ -97,87 +138,476 @@ SUGGESTED_LENGTH = CFG["generation"]["suggested_length"]
 
 
 # Ensure folders exist
-for f in [FINAL_FOLDER, TEMP_FOLDER]:
+for f in [FINAL_FOLDER, TEMP_FOLDER, CACHE_FOLDER]:
     if not os.path.exists(f):
         os.makedirs(f)
 
+# Sheet entries look like "word" or "word (hint)"; partition scans the text once
+def parse_entry(raw):
+    head, sep, tail = raw.partition("(")
+    return head.strip(), (tail.replace(")", "").strip() if sep else "") or "None"
+
+class _SafeNameTable(dict):
+    """str.translate table that drops non-alphanumerics; non-ASCII code points are classified on first sight."""
+    def __missing__(self, cp):
+        keep = cp if chr(cp).isalnum() else None
+        self[cp] = keep
+        return keep
+
+_SAFE_TBL = _SafeNameTable({i: (i if chr(i).isalnum() else None) for i in range(128)})
+
+def make_safe_name(word, ext, ts=None):
+    # Pass the card's timestamp so its image and audio files share a stem
+    return word.translate(_SAFE_TBL) + f"_{ts or int(time.time())}{ext}"
+
+def _move_fast(src, dst):
+    # Single rename when temp/ and final/ share a filesystem; copy + remove otherwise
+    try:
+        os.replace(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+        # The copy is what matters; a temp file another process holds is swept on exit
+        try: os.unlink(src)
+        except OSError: pass
+
 # --- 2. GOOGLE SHEETS MANAGER ---
+SHEET_FLUSH_EVERY = 10
+
 class SheetManager:
     def __init__(self, creds_file="credentials.json", sheet_name=SHEET_NAME):
         self.scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
         self.creds = ServiceAccountCredentials.from_json_keyfile_name(creds_file, self.scope)
         self.client = gspread.authorize(self.creds)
         self.sheet = self.client.open(sheet_name).sheet1
+        self._records = None
+        self._pending_updates = []
+        self._lock = threading.Lock()
 
-    def fetch_pending_words(self, limit=BATCH_LIMIT):
+    def fetch_pending_words(self, limit=BATCH_LIMIT, headless=False):
         try:
-            records = self.sheet.get_all_records()
+            # One range read (Word in A, Status in B) instead of get_all_records' header/dict pass
+            if self._records is None:
+                self._records = self.sheet.batch_get(["A2:B"])[0]
             pending = []
-            for i, row in enumerate(records):
+            for i, row in enumerate(self._records, start=2):
                 if len(pending) >= limit: break
                 
-                status = str(row.get("Status", "")).strip().lower()
-                word = str(row.get("Word", "")).strip()
+                word = str(row[0]).strip() if row else ""
+                status = str(row[1]).strip().lower() if len(row) > 1 else ""
                 
                 if status not in ["done", "skipped"] and word:
-                    pending.append({"text": word, "row_idx": i + 2})
+                    pending.append({"text": word, "row_idx": i})
             return pending
         except Exception as e:
-            messagebox.showerror("Sheets Error", f"Could not read sheet: {e}")
+            # The --batch CLI has no Tk root; a dialog there would spawn a stray window
+            if headless: print(f"❌ Could not read sheet: {e}")
+            else: messagebox.showerror("Sheets Error", f"Could not read sheet: {e}")
             return []
 
-    def mark_as_done(self, row_idx):
-        try:
-            self.sheet.update_cell(row_idx, 2, "Done")
-        except Exception as e:
-            print(f"❌ Failed to update sheet: {e}")
-    def mark_as_skipped(self, row_idx):
+    # Status writes are queued and sent in one batch_update by flush_updates(),
+    # every SHEET_FLUSH_EVERY cards and on exit, so a crash loses at most a few marks
+    def queue_done(self, row_idx):
+        self._queue_status(row_idx, "Done")
+
+    def queue_skipped(self, row_idx):
+        self._queue_status(row_idx, "Skipped")
+
+    def _queue_status(self, row_idx, status):
+        with self._lock:
+            self._pending_updates.append({"range": f"B{row_idx}", "values": [[status]]})
+            due = len(self._pending_updates) >= SHEET_FLUSH_EVERY
+        if due:
+            self.flush_updates()
+
+    def flush_updates(self):
+        with self._lock:
+            updates, self._pending_updates = self._pending_updates, []
+        if not updates:
+            return
         try:
-            self.sheet.update_cell(row_idx, 2, "Skipped")
+            self.sheet.batch_update(updates)
         except Exception as e:
             print(f"❌ Failed to update sheet: {e}")
+            with self._lock:
+                self._pending_updates = updates + self._pending_updates
                    
 
-# --- 3. GENERATION LOGIC ---
-
-# Update the arguments to accept 'instruction'
-def generate_text_data(word, hint="None", instruction=None):
-    # Base prompt
-    base_prompt = f"""
-    Task: Create a language flashcard for: "{word}" (Context: {hint}).
-    Target Language: {TARGET_LANGUAGE}
-    """
-
-    # Add the user instruction if it exists
-    if instruction:
-        base_prompt += f"\nIMPORTANT USER INSTRUCTION: {instruction}\n"
-
-    # Rest of the prompt remains the same
-    base_prompt += f"""
-    Output a SINGLE JSON object with these keys:
+# --- 3. RESPONSE CACHE ---
+TEXT_MODEL = "gemini-3.1-flash-lite"
+PROMPT_VERSION = "v2"  # Bump when the card prompt changes to invalidate old entries
+TEXT_CACHE_TTL = 30 * 86400
+
+class LRUCache:
+    """Small thread-safe in-memory LRU, kept in front of the on-disk caches."""
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.data:
+                return None
+            self.data.move_to_end(key)
+            return self.data[key]
+
+    def put(self, key, value):
+        with self.lock:
+            self.data[key] = value
+            self.data.move_to_end(key)
+            if len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+class TextCache:
+    """SQLite store of Gemini card JSON, so re-reviewed words skip the API call."""
+    def __init__(self, path, ttl=TEXT_CACHE_TTL):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("CREATE TABLE IF NOT EXISTS text_cache (key TEXT PRIMARY KEY, value TEXT, created REAL)")
+        self.db.commit()
+        # Revisiting cards within a session is served from memory; misses are not memoized
+        self.memo = LRUCache(2048)
+
+    @staticmethod
+    def make_key(word, hint):
+        raw = f"{CARD_FINGERPRINT}|{word}|{hint}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        row = self.memo.get(key)
+        if row is None:
+            with self.lock:
+                row = self.db.execute("SELECT value, created FROM text_cache WHERE key = ?", (key,)).fetchone()
+            if not row:
+                return None
+            row = (orjson.loads(row[0]), row[1])
+            self.memo.put(key, row)
+        value, created = row
+        if time.time() - created > self.ttl:
+            return None
+        return dict(value)
+
+    def set(self, key, value):
+        self.memo.put(key, (dict(value), time.time()))
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO text_cache VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), time.time())
+            )
+            self.db.commit()
+
+text_cache = TextCache(os.path.join(CACHE_FOLDER, "text_cache.sqlite"))
+
+
+EMBED_MODEL = "text-embedding-004"
+IMAGE_CACHE_THRESHOLD = 0.92
+
+def _normalize(vec):
+    norm = sum(v * v for v in vec) ** 0.5 or 1.0
+    return [v / norm for v in vec]
+
+class ImageCache:
+    """Scenario embeddings of approved images, so paraphrased scenarios reuse an existing picture."""
+    def __init__(self, path, threshold=IMAGE_CACHE_THRESHOLD):
+        self.threshold = threshold
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("CREATE TABLE IF NOT EXISTS image_cache (image_path TEXT PRIMARY KEY, word TEXT, scenario TEXT, embedding TEXT)")
+        self.db.commit()
+        # Small collection (one row per approved card), so a brute-force scan stays in memory
+        self.entries = [
+            (word, scenario, image_path, orjson.loads(emb))
+            for image_path, word, scenario, emb in self.db.execute("SELECT * FROM image_cache")
+        ]
+        # Exact-scenario index, checked before paying for an embedding
+        self.exact = {self.scenario_key(e[1]): e for e in self.entries}
+
+    @staticmethod
+    def scenario_key(scenario):
+        return hashlib.sha256(scenario.strip().encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _usable(entry, word):
+        e_word, e_scenario, e_path, _ = entry
+        # Lexical guard: a scene built around another card's word may give that word away
+        if e_word.lower() != word.lower() and e_word.lower() in e_scenario.lower():
+            return False
+        return os.path.exists(e_path)
+
+    def lookup_exact(self, scenario, word):
+        """Returns the approved image for this exact scenario text, or None."""
+        with self.lock:
+            entry = self.exact.get(self.scenario_key(scenario))
+        return entry[2] if entry and self._usable(entry, word) else None
+
+    def lookup(self, vec, word):
+        """Returns the closest approved image path at or above the threshold, or None."""
+        vec = _normalize(vec)
+        with self.lock:
+            entries = list(self.entries)
+        best_path, best_sim = None, self.threshold
+        for entry in entries:
+            sim = sum(a * b for a, b in zip(vec, entry[3]))
+            if sim < best_sim or not self._usable(entry, word):
+                continue
+            best_path, best_sim = entry[2], sim
+        return best_path
+
+    def add(self, word, scenario, vec, image_path):
+        vec = _normalize(vec)
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO image_cache VALUES (?, ?, ?, ?)",
+                (image_path, word, scenario, json.dumps(vec))
+            )
+            self.db.commit()
+            entry = (word, scenario, image_path, vec)
+            self.entries.append(entry)
+            self.exact[self.scenario_key(scenario)] = entry
+
+image_cache = ImageCache(os.path.join(CACHE_FOLDER, "image_cache.sqlite"))
+
+# Identical scenarios (common across reruns) skip the embedding API
+embed_memo = LRUCache(1024)
+
+
+# --- 4. GENERATION LOGIC ---
+
+class RateLimiter:
+    """Spaces calls evenly under a requests-per-minute cap, so bursts don't trip 429 backoff."""
+    def __init__(self, rpm):
+        self.interval = 60.0 / rpm
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    async def acquire(self):
+        # Reserve the next free slot, then sleep until it arrives
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+gemini_limiter = RateLimiter(GEMINI_RPM)
+image_limiter = RateLimiter(IMAGE_RPM)
+
+# Retries for transient API failures (rate limits, 5xx, dropped connections). The OpenAI SDK
+# and http_session already retry on their own, so only Gemini and fal calls go through this
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.5  # seconds, doubled per attempt
+RETRY_MAX_DELAY = 5
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+def _is_transient(e):
+    if isinstance(e, genai_errors.APIError):
+        return e.code in RETRY_STATUS
+    if isinstance(e, httpx.HTTPStatusError):
+        return e.response.status_code in RETRY_STATUS
+    if isinstance(e, fal_client.FalClientHTTPError):  # fal wraps httpx's status errors in its own type
+        return e.status_code in RETRY_STATUS
+    return isinstance(e, (httpx.TransportError, requests.ConnectionError, requests.Timeout, asyncio.TimeoutError,
+                          fal_client.FalClientTimeoutError))
+
+async def with_retries(call, what):
+    """Awaits call() (a fresh coroutine per attempt), backing off exponentially on transient errors."""
+    for attempt in range(RETRY_ATTEMPTS):
+        try:
+            return await call()
+        except Exception as e:
+            if attempt == RETRY_ATTEMPTS - 1 or not _is_transient(e):
+                raise
+            # Jitter keeps parallel workers from retrying in lockstep
+            delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt) * random.uniform(0.5, 1.0)
+            print(f"🔁 {what} failed ({e}); retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+# Prompt pieces and request config are built once at import; calls only fill in the word.
+# The card rules never change, so they ride in system_instruction and each request
+# carries just the word(s)
+CARD_KEYS = f"""
     - definition: STRICTLY just the definition IN TARGET LANGUAGE. No grammar notes.
     - sentence: A natural sentence using it in the Target Language at {CEFR_LVL} Level. Try not to exceed {SUGGESTED_LENGTH} words. 
     - translation: English translation of that sentence.
     - scenario: A vivid visual description for an artist IN ENGLISH. Describe lighting, subject, and environment.
     """
-    
+
+SYSTEM_PROMPT = (
+    "You create language flashcards.\n"
+    f"Target Language: {TARGET_LANGUAGE}\n"
+    "Every card is a JSON object with these keys:" + CARD_KEYS
+)
+
+# Structured output: the model is constrained to exactly these string fields, so replies
+# never need repairing and a batch always comes back as an array of cards
+CARD_FIELDS = ["definition", "sentence", "translation", "scenario"]
+CARD_SCHEMA = types.Schema(
+    type=types.Type.OBJECT,
+    properties={k: types.Schema(type=types.Type.STRING) for k in CARD_FIELDS},
+    required=CARD_FIELDS,
+    property_ordering=CARD_FIELDS
+)
+
+# Everything besides the word that shapes a card: model, prompt version and the full system
+# prompt (target language, CEFR level, sentence length). Part of every text-cache key and
+# stamped on the saved review cache, so a config.json change never serves old cards
+CARD_FINGERPRINT = hashlib.sha256(
+    f"{TEXT_MODEL}|{PROMPT_VERSION}|{SYSTEM_PROMPT}".encode("utf-8")
+).hexdigest()
+
+TEXT_CONFIG = types.GenerateContentConfig(
+    system_instruction=SYSTEM_PROMPT,
+    response_mime_type="application/json",
+    response_schema=CARD_SCHEMA
+)
+
+BATCH_TEXT_CONFIG = types.GenerateContentConfig(
+    system_instruction=SYSTEM_PROMPT,
+    response_mime_type="application/json",
+    response_schema=types.Schema(type=types.Type.ARRAY, items=CARD_SCHEMA)
+)
+
+PROMPT_TMPL = (
+    'Create a flashcard for: "{word}" (Context: {hint}).\n'
+    "{instruction}\n"
+    "Output a SINGLE JSON object."
+)
+
+BATCH_PROMPT_TMPL = (
+    "Create flashcards for each entry of this list: {words}\n"
+    "Return a JSON array where element i is the card for entry i, in the same order."
+)
+
+# response_mime_type already asks for bare JSON; the fence strip is only a fallback
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$")
+
+def loads_model_json(text):
     try:
-        response = google_client.models.generate_content(
-            model="gemini-3.1-flash-lite", 
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return orjson.loads(_FENCE_RE.sub("", text))
+
+# Update the arguments to accept 'instruction'
+async def agenerate_text_data(word, hint="None", instruction=None, use_cache=True):
+    # Serve repeat words from disk; regenerations pass use_cache=False and overwrite the entry
+    key = TextCache.make_key(word, hint)
+    if use_cache:
+        cached = text_cache.get(key)
+        if cached: return cached
+
+    # Add the user instruction if it exists
+    base_prompt = PROMPT_TMPL.format(
+        word=word,
+        hint=hint,
+        instruction=f"IMPORTANT USER INSTRUCTION: {instruction}" if instruction else ""
+    )
+    
+    async def call():
+        # Every attempt waits for its own limiter slot
+        await gemini_limiter.acquire()
+        return await google_client.aio.models.generate_content(
+            model=TEXT_MODEL, 
             contents=base_prompt,
-            config=types.GenerateContentConfig(response_mime_type="application/json")
+            config=TEXT_CONFIG
         )
-        raw = response.text.strip()
-        if raw.startswith("```"): raw = raw.split("\n", 1)[-1].rsplit("\n", 1)[0]
-        parsed = json.loads(raw)
+
+    try:
+        response = await with_retries(call, f"Text ({word})")
+        parsed = loads_model_json(response.text)
         if isinstance(parsed, list): parsed = parsed[0]
+        text_cache.set(key, parsed)
         return parsed
     except Exception as e:
         print(f"❌ Text Error ({word}): {e}")
         return None
-    
 
-def generate_image_fal(scenario, filename):
+
+TEXT_BATCH_SIZE = 10
+
+async def agenerate_text_batch(items):
+    """
+    Generates cards for several (word, hint) pairs in a single Gemini request.
+    Returns a list aligned with items; entries are None where the batch gave
+    nothing usable, so callers can fall back to agenerate_text_data.
+    """
+    results = [text_cache.get(TextCache.make_key(w, h)) for w, h in items]
+    missing = [i for i, r in enumerate(results) if r is None]
+    if len(missing) < 2:
+        return results
+
+    words = [{"word": items[i][0], "context": items[i][1]} for i in missing]
+    prompt = BATCH_PROMPT_TMPL.format(words=json.dumps(words, ensure_ascii=False))
+
+    try:
+        await gemini_limiter.acquire()
+        response = await google_client.aio.models.generate_content(
+            model=TEXT_MODEL, 
+            contents=prompt,
+            config=BATCH_TEXT_CONFIG
+        )
+        parsed = loads_model_json(response.text)
+        if not isinstance(parsed, list) or len(parsed) != len(missing):
+            print(f"⚠️ Batch returned {len(parsed) if isinstance(parsed, list) else 'no'} cards for {len(missing)} words")
+            return results
+        for i, card in zip(missing, parsed):
+            if isinstance(card, dict) and "definition" in card:
+                text_cache.set(TextCache.make_key(*items[i]), card)
+                results[i] = card
+    except Exception as e:
+        print(f"❌ Batch Text Error ({len(missing)} words): {e}")
+    return results
+
+
+DOWNLOAD_CHUNK = 1 << 16
+
+def download_file(url, path):
+    """Streams url into path a chunk at a time; returns the HTTP status code."""
+    with http_session.get(url, stream=True, timeout=HTTP_TIMEOUT) as r:
+        if r.status_code != 200:
+            return r.status_code
+        with open(path, "wb") as f:
+            for chunk in r.iter_content(DOWNLOAD_CHUNK):
+                f.write(chunk)
+    return r.status_code
+
+# Shared flux style prompt (fal + Fireworks); only the scenario changes per call
+FLUX_PROMPT_TMPL = (
+    "2D vector illustration, flat design, SVG style, clean paths, no gradients.\n"
+    "Minimalist, professional corporate illustration, thick strokes, bold outlines.\n"
+    "White background. No text.\n"
+    "Scenario: {}"
+)
+FIREWORKS_URL = "https://api.fireworks.ai/inference/v1/workflows/accounts/fireworks/models/flux-1-schnell-fp8/text_to_image"
+FIREWORKS_HEADERS = {
+    "Authorization": f"Bearer {FIREWORKS_API_KEY}",
+    "Content-Type": "application/json",
+    "Accept": "image/jpeg"
+}
+FIREWORKS_PAYLOAD = {"aspect_ratio": "1:1", "num_inference_steps": 10, "num_images": 1}
+# Built on first use, since the default pipeline never calls Fireworks. With h2 installed,
+# concurrent image calls share one TLS connection as multiplexed streams (HTTP/1.1 otherwise);
+# the transport retries failed connects
+_fireworks_http = None
+
+def get_fireworks_http():
+    global _fireworks_http
+    if _fireworks_http is None:
+        _fireworks_http = httpx.AsyncClient(
+            headers=FIREWORKS_HEADERS,
+            timeout=httpx.Timeout(60, connect=5),
+            transport=httpx.AsyncHTTPTransport(
+                http2=HTTP2, retries=3,
+                limits=httpx.Limits(max_connections=MAX_WORKERS * 4, max_keepalive_connections=MAX_WORKERS * 2),
+            ),
+        )
+    return _fireworks_http
+
+async def close_fireworks_http():
+    if _fireworks_http is not None:
+        await _fireworks_http.aclose()
+
+async def agenerate_image_fal(scenario, filename):
     # Optional: callback for real-time progress logs
     def on_queue_update(update):
         if isinstance(update, fal_client.InProgress):
@@ -186,14 +616,10 @@ def generate_image_fal(scenario, filename):
 
     try:
         # Strictly following the docs you provided
-        result = fal_client.subscribe(
+        result = await with_retries(lambda: fal_client.subscribe_async(
             "fal-ai/flux/schnell",
             arguments={
-                "prompt": f"""
-                2D vector illustration, flat design, SVG style, clean paths, no gradients.
-                Minimalist, professional corporate illustration, thick strokes, bold outlines.
-                White background. No text. 
-                Scenario: {scenario}""",
+                "prompt": FLUX_PROMPT_TMPL.format(scenario),
                 "image_size": "square",
                 "num_inference_steps": 4,
                 "num_images": 1,
@@ -202,22 +628,19 @@ def generate_image_fal(scenario, filename):
             },
             with_logs=True,
             on_queue_update=on_queue_update,
-        )
+        ), f"Image ({filename})")
 
         # The result schema shows an 'images' list containing a 'url'
         if result and "images" in result and len(result["images"]) > 0:
             image_url = result["images"][0]["url"]
             
             # Download the image to your local path
-            img_response = requests.get(image_url)
-            if img_response.status_code == 200:
-                # Ensure TEMP_FOLDER is defined in your script
-                path = os.path.join(TEMP_FOLDER, filename)
-                with open(path, "wb") as f:
-                    f.write(img_response.content)
+            path = os.path.join(TEMP_FOLDER, filename)
+            status = await asyncio.to_thread(download_file, image_url, path)
+            if status == 200:
                 return path, None
             else:
-                return None, f"Failed to download image: {img_response.status_code}"
+                return None, f"Failed to download image: {status}"
         
         return None, "API call succeeded but no images were returned."
 
@@ -226,28 +649,10 @@ def generate_image_fal(scenario, filename):
         print(f"Detailed Fal Error: {e}")
         return None, str(e)
             
-def generate_image_fireworks(scenario, filename):
+async def agenerate_image_fireworks(scenario, filename):
     try:
-        url = "https://api.fireworks.ai/inference/v1/workflows/accounts/fireworks/models/flux-1-schnell-fp8/text_to_image"
-        
-        headers = {
-            "Authorization": f"Bearer {FIREWORKS_API_KEY}",
-            "Content-Type": "application/json",
-            "Accept": "image/jpeg"
-        }
-        
-        payload = {
-            "prompt": f"""
-            2D vector illustration, flat design, SVG style, clean paths, no gradients.
-            Minimalist, professional corporate illustration, thick strokes, bold outlines.
-            White background. No text. 
-            Scenario: {scenario}""",
-            "aspect_ratio": "1:1",
-            "num_inference_steps": 10,
-            "num_images": 1
-        }
-
-        response = requests.post(url, headers=headers, json=payload)
+        payload = {**FIREWORKS_PAYLOAD, "prompt": FLUX_PROMPT_TMPL.format(scenario)}
+        response = await get_fireworks_http().post(FIREWORKS_URL, content=orjson.dumps(payload))
         
         if response.status_code == 200:
             path = os.path.join(TEMP_FOLDER, filename)
@@ -261,19 +666,30 @@ def generate_image_fireworks(scenario, filename):
     except Exception as e:
         return None, str(e)
 
-def generate_image_dalle(scenario, filename):
+B64_CHUNK = 1 << 16  # Multiple of 4, so every slice decodes on its own
+
+def write_b64(path, b64):
+    """Decodes base64 into a file slice by slice instead of materializing the whole image."""
+    with open(path, "wb") as f:
+        for i in range(0, len(b64), B64_CHUNK):
+            f.write(base64.b64decode(b64[i:i + B64_CHUNK]))
+
+def dalle_prompt(scenario):
+    return (
+        f"Vector art illustration. White background. No text. "
+        f"Object: {scenario}"
+    )
+
+async def agenerate_image_dalle(scenario, filename):
     try:
         mode = CFG["generation"].get("image_mode", "standard").lower()
         
-        safe_prompt = (
-            f"Vector art illustration. White background. No text. "
-            f"Object: {scenario}"
-        )
+        safe_prompt = dalle_prompt(scenario)
 
         # --- MINI MODE (Bare Bones) ---
         if mode == "mini":
             # Strip ALL optional parameters to prevent 400 Errors
-            response = openai_client.images.generate(
+            response = await openai_async.images.generate(
                 model="gpt-image-1-mini", 
                 prompt=safe_prompt,
                 quality=f"{IMG_QUALITY}",
@@ -282,17 +698,15 @@ def generate_image_dalle(scenario, filename):
             
             # Decode Base64
             if hasattr(response.data[0], 'b64_json') and response.data[0].b64_json:
-                img_data = base64.b64decode(response.data[0].b64_json)
                 path = os.path.join(TEMP_FOLDER, filename)
-                with open(path, "wb") as f:
-                    f.write(img_data)
+                await asyncio.to_thread(write_b64, path, response.data[0].b64_json)
                 return path, None
             else:
                 return None, "API returned no data"
 
         # --- STANDARD MODE (DALL-E 3) ---
         else:
-            response = openai_client.images.generate(
+            response = await openai_async.images.generate(
                 model="dall-e-3", 
                 prompt=safe_prompt,
                 size="1024x1024", 
@@ -300,10 +714,10 @@ def generate_image_dalle(scenario, filename):
                 n=1
             )
             img_url = response.data[0].url
-            img_data = requests.get(img_url).content
             path = os.path.join(TEMP_FOLDER, filename)
-            with open(path, "wb") as f:
-                f.write(img_data)
+            status = await asyncio.to_thread(download_file, img_url, path)
+            if status != 200:
+                return None, f"Failed to download image: {status}"
             return path, None
 
     except BadRequestError as e:
@@ -317,37 +731,113 @@ def generate_image_dalle(scenario, filename):
         print(f"❌ Image Error ({filename}): {e}")
         return None, f"Error: {str(e)[:20]}..."
 
-def generate_image(scenario, safe_name, model):
+async def alookup_cached_image(word, scenario, filename):
+    """Copies an approved image with a near-identical scenario into TEMP_FOLDER, if one exists."""
+    if not scenario:
+        return None
+    try:
+        src = image_cache.lookup_exact(scenario, word)
+        if not src:
+            vec = embed_memo.get(scenario)
+            if vec is None:
+                result = await google_client.aio.models.embed_content(model=EMBED_MODEL, contents=scenario)
+                vec = result.embeddings[0].values
+                embed_memo.put(scenario, vec)
+            src = image_cache.lookup(vec, word)
+        if not src:
+            return None
+        path = os.path.join(TEMP_FOLDER, filename)
+        await asyncio.to_thread(shutil.copyfile, src, path)
+        print(f"♻️ Reused cached image for '{word}'")
+        return path
+    except Exception as e:
+        print(f"⚠️ Image cache lookup failed ({word}): {e}")
+        return None
+
+def remember_image(word, scenario, image_path):
+    """Indexes an approved image by its scenario embedding for later reuse."""
+    if not scenario:
+        return
+    try:
+        vec = embed_memo.get(scenario)
+        if vec is None:
+            result = google_client.models.embed_content(model=EMBED_MODEL, contents=scenario)
+            vec = result.embeddings[0].values
+            embed_memo.put(scenario, vec)
+        image_cache.add(word, scenario, vec, image_path)
+    except Exception as e:
+        print(f"⚠️ Could not index image for '{word}': {e}")
+
+async def agenerate_image(scenario, safe_name, model, word=None):
+    # Passing the card word enables reuse of a cached image; regenerations omit it
+    if word:
+        path = await alookup_cached_image(word, scenario, safe_name)
+        if path: return path, None
+
+    await image_limiter.acquire()
     if model == "fal":
-        return generate_image_fal(scenario, safe_name)
+        return await agenerate_image_fal(scenario, safe_name)
     else:
-        return generate_image_dalle(scenario, safe_name)        
+        return await agenerate_image_dalle(scenario, safe_name)
 
 
+# One long-lived synthesizer keeps its Azure connection open between cards
+_synthesizer = None
+_synth_lock = threading.Lock()
+
+def _get_synthesizer():
+    global _synthesizer
+    if _synthesizer is None:
+        speech_config = speechsdk.SpeechConfig(subscription=AZURE_SPEECH_KEY, region=AZURE_SPEECH_REGION)
+        speech_config.speech_synthesis_voice_name = CFG["generation"]["azure_voice"]
+        speech_config.set_speech_synthesis_output_format(speechsdk.SpeechSynthesisOutputFormat.Audio16Khz32KBitRateMonoMp3)
+        # audio_config=None returns the MP3 bytes in memory instead of binding an output file
+        _synthesizer = speechsdk.SpeechSynthesizer(speech_config=speech_config, audio_config=None)
+    return _synthesizer
+
 def generate_audio_azure(text, filename):
     if not AZURE_SPEECH_KEY or not AZURE_SPEECH_REGION:
         print("❌ CRITICAL: Azure Keys are missing from .env file!")
         return None
 
     try:
-        speech_config = speechsdk.SpeechConfig(subscription=AZURE_SPEECH_KEY, region=AZURE_SPEECH_REGION)
-        speech_config.speech_synthesis_voice_name = CFG["generation"]["azure_voice"]
-        speech_config.set_speech_synthesis_output_format(speechsdk.SpeechSynthesisOutputFormat.Audio16Khz32KBitRateMonoMp3)
-        
-        path = os.path.join(TEMP_FOLDER, filename)
-        audio_config = speechsdk.audio.AudioOutputConfig(filename=path)
-        synthesizer = speechsdk.SpeechSynthesizer(speech_config=speech_config, audio_config=audio_config)
-        
-        result = synthesizer.speak_text_async(text).get()
+        with _synth_lock:
+            result = _get_synthesizer().speak_text_async(text).get()
         
         if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
+            path = os.path.join(TEMP_FOLDER, filename)
+            with open(path, "wb") as f:
+                f.write(result.audio_data)
             return path
         return None
     except Exception as e:
         print(f"❌ Audio Exception ({filename}): {e}")
         return None
 
-# --- 4. THE GUI APP ---
+# --- 5. THE GUI APP ---
+# Column order: Target, Definition, Sentence, Translation, Scenario, Image, Audio
+PREFETCH_WINDOW = 20
+THUMB_SIZE = 450  # px, matches the image frame width
+UI_POLL_MS = 50
+TOAST_MS = 4000
+REVIEW_CACHE_FILE = os.path.join(CACHE_FOLDER, "review_cache.json")
+REGEN_CANDIDATES = 3  # images generated in parallel per "Regen Image"; the reviewer picks one
+PICKER_THUMB_SIZE = 200
+PHOTO_CACHE_SIZE = 32
+
+def load_thumbnail(path, size=THUMB_SIZE):
+    """Decodes path straight to a size x size thumbnail (worker threads only)."""
+    # Closing the source releases the temp file (Windows won't move or delete an open file)
+    with Image.open(path) as load:
+        # JPEG decodes straight at reduced scale; PNGs are halved with the
+        # box-filter reduce() until one bilinear pass finishes the job
+        load.draft("RGB", (size, size))
+        if load.mode in ("P", "1"):
+            load = load.convert("RGBA")  # reduce() rejects palette and bilevel images
+        while min(load.size) >= 2 * size:
+            load = load.reduce(2)
+        load.thumbnail((size, size), Image.Resampling.BILINEAR, reducing_gap=None)
+    return load
 
 class ReviewApp:
     def __init__(self, root, sheet_manager):
@@ -364,17 +854,45 @@ class ReviewApp:
             root.destroy()
             return
             
-        self.word_queue = [item["text"] for item in self.raw_data]
-        self.cache = {} 
+        # Parse "word (hint)" once; everything after this indexes self.parsed
+        self.parsed = [parse_entry(item["text"]) for item in self.raw_data]
+        self.word_queue = [word for word, _ in self.parsed]
+        self.cache = self._load_review_cache()
         self.current_word = None
         self.viewing_index = 0
         self.last_index = -1
+        # UI-facing work (approval audio/moves, sheet marks, thumbnail decodes)
         self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS)
-        self.after_id = None
+
+        # Network pipeline runs on its own asyncio loop so Tk's mainloop stays responsive.
+        # Its blocking helpers (downloads, file writes) get a separate pool sized to the
+        # image gate, so prefetch never queues ahead of an approval
+        self.loop = asyncio.new_event_loop()
+        self.loop_executor = concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS * 4)
+        self.loop.set_default_executor(self.loop_executor)
+        # Separate gates so fast text batches run ahead of slow image calls
+        self.text_sem = asyncio.Semaphore(MAX_WORKERS * 4)
+        self.image_sem = asyncio.Semaphore(MAX_WORKERS * 4)
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+
+        # Approved rows go to a writer thread that keeps the CSV open between cards
+        self._csv_f = open(CSV_FILE, "a", newline="", encoding="utf-8", buffering=1 << 16)
+        self._csv_w = csv.writer(self._csv_f, delimiter=':')
+        self._csv_q = queue.Queue()
+        self._csv_thread = threading.Thread(target=self._csv_writer_loop, daemon=True)
+        self._csv_thread.start()
         self.is_closing = False
         self.last_loaded_path = "" 
+        # (path, THUMB_SIZE) -> PhotoImage, reused when a card is shown again; bounded so a long
+        # session doesn't keep every thumbnail alive (the shown one is also held by lbl_img.image)
+        self._photo_cache = LRUCache(PHOTO_CACHE_SIZE)
+        # Worker threads never touch Tk: they queue (callback, args) and _drain_ui runs them
+        self.ui_queue = queue.SimpleQueue()
 
         self.setup_ui()
+        # Closing the window takes the same path as "Save & Exit", so the CSV and sheet get flushed
+        self.root.protocol("WM_DELETE_WINDOW", self.exit_app)
+        self._drain_ui()
         self.start_prefetching()
         self.load_current_view()
 
@@ -405,7 +923,7 @@ class ReviewApp:
         content = tk.Frame(self.root)
         content.pack(side="top", fill="both", expand=True)
         
-        self.img_frame = tk.Frame(content, bg="#ddd", width=450)
+        self.img_frame = tk.Frame(content, bg="#ddd", width=THUMB_SIZE)
         self.img_frame.pack(side="left", fill="both", expand=True, padx=10, pady=10)
         self.lbl_img = tk.Label(self.img_frame, text="Waiting...", bg="#ddd")
         self.lbl_img.pack(expand=True, fill="both")
@@ -436,78 +954,223 @@ class ReviewApp:
                 return
         
         self.is_closing = True
-        if self.after_id: self.root.after_cancel(self.after_id)
+        self._shutdown_workers()
+        # Temp cleanup runs on the workers so the window closes immediately;
+        # images still referenced by the saved review cache are kept for the next run
+        keep = {os.path.normpath(e["image_path"]) for e in self.cache.values() if e.get("image_path")}
         try:
-            for filename in os.listdir(TEMP_FOLDER):
-                file_path = os.path.join(TEMP_FOLDER, filename)
-                if os.path.isfile(file_path):
-                    try: os.unlink(file_path)
-                    except: pass
-        except: pass
+            with os.scandir(TEMP_FOLDER) as it:
+                for entry in it:
+                    if entry.is_file() and os.path.normpath(entry.path) not in keep:
+                        self.executor.submit(os.unlink, entry.path)
+        except OSError: pass
+        # Queued jobs (unlinks, pending sheet marks) still finish; nothing new is accepted
+        self.executor.shutdown(wait=False)
         self.root.destroy()
 
+    def _shutdown_workers(self):
+        """Stops the generation loop and flushes everything queued for the CSV and the sheet."""
+        asyncio.run_coroutine_threadsafe(self._close_loop(), self.loop)
+        http_session.close()
+        self._csv_q.put(None)
+        self._csv_thread.join(timeout=5)
+        self.sheet_mgr.flush_updates()
+        self._save_review_cache()
+
+    async def _close_loop(self):
+        # The HTTP/2 clients belong to this loop, so close its connections here before stopping
+        try: await asyncio.gather(close_fireworks_http(), openai_async.close(), return_exceptions=True)
+        finally:
+            self.loop.stop()
+            self.loop_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _load_review_cache(self):
+        """Restores cards generated in an earlier session, dropping any whose hint changed or image is gone."""
+        try:
+            with open(REVIEW_CACHE_FILE, "rb") as f:
+                saved = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            return {}
+        # Cards written under other generation settings (or an older file format) are stale
+        if not isinstance(saved, dict) or saved.get("fingerprint") != CARD_FINGERPRINT:
+            return {}
+        hints = dict(self.parsed)
+        cache = {}
+        for word, entry in saved.get("cards", {}).items():
+            if hints.get(word) != entry.get("hint"):
+                continue
+            entry.pop("image_error", None)
+            entry.pop("force_text_update", None)
+            if not os.path.exists(entry.get("image_path") or ""):
+                entry.pop("image_path", None)
+                entry.pop("ts", None)
+            cache[word] = entry
+        return cache
+
+    def _save_review_cache(self):
+        # Tk thread only (it owns self.cache); write-then-rename so a crash never leaves half a file
+        tmp = REVIEW_CACHE_FILE + ".tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(orjson.dumps({"fingerprint": CARD_FINGERPRINT, "cards": self.cache}))
+            os.replace(tmp, REVIEW_CACHE_FILE)
+        except (OSError, TypeError) as e:
+            print(f"⚠️ Could not save review cache: {e}")
+
+    def _csv_writer_loop(self):
+        # --- CSV WRITE (COLON SEPARATOR, NO HEADER) ---
+        # Rows reach the file before their "Done" marks are queued for the sheet, so a crash can
+        # never leave a row marked Done whose card is still sitting in the write buffer
+        marks = []
+        while True:
+            item = self._csv_q.get()
+            if item is None: break
+            row, row_id = item
+            self._csv_w.writerow(row)
+            marks.append(row_id)
+            # A burst of approvals shares one flush; an idle queue flushes straight away
+            if self._csv_q.empty():
+                self._flush_csv(marks)
+        self._flush_csv(marks)
+        self._csv_f.close()
+
+    def _flush_csv(self, marks):
+        self._csv_f.flush()
+        for row_id in marks:
+            self.sheet_mgr.queue_done(row_id)
+        marks.clear()
+
     def start_prefetching(self):
         self.update_status(f"🚀 Starting background workers...")
-        for raw in self.word_queue:
-            if "(" in raw:
-                word = raw.split("(")[0].strip()
-                hint = raw.split("(")[1].replace(")", "").strip()
-            else:
-                word = raw
-                hint = "None"
-            
+        for word, hint in self.parsed:
             if word not in self.cache:
                 self.cache[word] = {"status": "pending", "hint": hint}
-            self.executor.submit(self.process_single_card, word, hint)
+        self._prefetch_end = 0
+        self._scheduled = set()
+        self._inflight = {}  # word -> Future of the job generating it (Tk thread only)
+        self._regenerating = set()  # words whose image the reviewer is regenerating
+        self._extend_prefetch()
+
+    def _extend_prefetch(self):
+        """Keeps generation PREFETCH_WINDOW cards ahead of the reviewer, one text batch at a time."""
+        target = min(len(self.parsed), self.viewing_index + PREFETCH_WINDOW)
+        while self._prefetch_end < target:
+            chunk = self.parsed[self._prefetch_end:self._prefetch_end + TEXT_BATCH_SIZE]
+            self._prefetch_end += len(chunk)
+            # Repeated sheet entries share one cache entry, so generate each word only once
+            jobs = []
+            for word, hint in chunk:
+                if word not in self._scheduled:
+                    self._scheduled.add(word)
+                    jobs.append((word, hint))
+            if jobs:
+                fut = asyncio.run_coroutine_threadsafe(self.process_chunk(jobs), self.loop)
+                for word, _ in jobs:
+                    self._inflight[word] = fut
+
+    def _ensure_upcoming(self, depth=3):
+        """Re-queues the next few cards if their job ended without an image (e.g. the text call failed)."""
+        for word, hint in self.parsed[self.viewing_index:self.viewing_index + depth]:
+            entry = self.cache.get(word, {})
+            if "image_path" in entry or "image_error" in entry:
+                continue
+            if word in self._inflight or word in self._regenerating or word not in self._scheduled:
+                continue
+            self._inflight[word] = asyncio.run_coroutine_threadsafe(self.process_single_card(word, hint), self.loop)
+
+    async def process_chunk(self, jobs):
+        # One Gemini request writes the whole chunk; per-card calls only fill in the gaps
+        todo = [(w, h) for w, h in jobs if "definition" not in self.cache.get(w, {})]
+        if todo:
+            async with self.text_sem:
+                self.update_status(f"📝 Writing text for {len(todo)} words...")
+                cards = await agenerate_text_batch(todo)
+            written = {w: card for (w, _), card in zip(todo, cards) if card}
+            for w, card in written.items():
+                self._post_update(w, card)
+        else:
+            written = {}
+        await asyncio.gather(*[self.process_single_card(w, h, written.get(w)) for w, h in jobs], return_exceptions=True)
 
-    def process_single_card(self, word, hint):
-        if word not in self.cache: 
+    async def process_single_card(self, word, hint, card=None):
+        try:
+            await self._process_single_card(word, hint, card)
+        finally:
+            self._ui(self._inflight.pop, word, None)
+
+    async def _process_single_card(self, word, hint, card):
+        # Runs on the loop thread: reads the cache, but all writes go through _post_update
+        entry = self.cache.get(word)
+        if entry is None:
             return
-        if "definition" not in self.cache[word]:
-            self.update_status(f"📝 Writing text for '{word}'...")
-            data = generate_text_data(word, hint)
-            if data: self.cache[word].update(data)
-        
-        if "image_path" not in self.cache[word] and "image_error" not in self.cache[word]:
-            scenario = self.cache[word].get("scenario", "")
-            self.update_status(f"🎨 Painting '{word}'...")
-            
-            safe_name = "".join([c for c in word if c.isalnum()]) + f"_{int(time.time())}.png"
+        if card is None and "definition" not in entry:
+            async with self.text_sem:
+                self.update_status(f"📝 Writing text for '{word}'...")
+                card = await agenerate_text_data(word, hint)
+            if card: self._post_update(word, card)
+            else: self._ui(self.toast, f"❌ Couldn't write text for '{word}'; it will be retried when it comes up")
+
+        scenario = (card or entry).get("scenario", "")
+        # Without text there is nothing to paint; _ensure_upcoming retries the card later
+        if scenario and "image_path" not in entry and "image_error" not in entry:
+            async with self.image_sem:
+                await self._process_image(word, scenario)
+
+    async def _process_image(self, word, scenario):
+        self.update_status(f"🎨 Painting '{word}'...")
+        
+        ts = int(time.time())
+        safe_name = make_safe_name(word, ".png", ts)
+        
+        # --- LOGIC: Use Fireworks for first 3, DALL-E for the rest ---
+        # We find the position of the word in the original queue
+        try:
+            # Find index of the word in the queue
+            current_idx = next(i for i, w in enumerate(self.word_queue) if w == word)
             
-            # --- LOGIC: Use Fireworks for first 3, DALL-E for the rest ---
-            # We find the position of the word in the original queue
-            try:
-                # Find index of the word by matching it back to the raw word_queue
-                current_idx = next(i for i, raw in enumerate(self.word_queue) if raw.startswith(word))
-                
-                if current_idx < 3:
-                    path, error = generate_image(scenario, safe_name, "fal")
-                else:
-                    path, error = generate_image(scenario, safe_name, "fal")
-            except StopIteration:
-                # Fallback to DALL-E if indexing fails
-                path, error = generate_image(scenario, safe_name, "fal")
-            # -------------------------------------------------------------
-
-            if path: 
-                self.cache[word]["image_path"] = path
-                self.update_status(f"✨ Ready: '{word}'")
-            elif error:
-                self.cache[word]["image_error"] = error
-                self.update_status(f"⚠️ Error: '{word}'")
+            if current_idx < 3:
+                path, error = await agenerate_image(scenario, safe_name, "fal", word)
+            else:
+                path, error = await agenerate_image(scenario, safe_name, "fal", word)
+        except StopIteration:
+            # Fallback to DALL-E if indexing fails
+            path, error = await agenerate_image(scenario, safe_name, "fal", word)
+        # -------------------------------------------------------------
+
+        if path: 
+            self._post_update(word, {"image_path": path, "ts": ts})
+            self.update_status(f"✨ Ready: '{word}'")
+        elif error:
+            self._post_update(word, {"image_error": error})
+            self._ui(self.toast, f"⚠️ Image failed for '{word}': {error}")
+
+    def _post_update(self, word, data):
+        """Hands a worker result to the Tk thread, which owns writes to self.cache."""
+        self._ui(self._apply_update, word, data)
+
+    def _apply_update(self, word, data):
+        entry = self.cache.setdefault(word, {})
+        if ("image_path" in data or "image_error" in data) and \
+                (word in self._regenerating or "image_path" in entry):
+            # A regen owns this card's image; a late prefetch result must not overwrite it
+            if data.get("image_path"):
+                try: os.remove(data["image_path"])
+                except OSError: pass
+            return
+        entry.update(data)
+        self._notify_cache_update(word)
                 
     def load_current_view(self):
-        if self.after_id: self.root.after_cancel(self.after_id)
         if self.is_closing: return
 
         if self.viewing_index >= len(self.word_queue):
             self.is_closing = True
+            self._shutdown_workers()
             messagebox.showinfo("Done", "All cards reviewed!")
             self.root.destroy()
             return
 
-        raw = self.word_queue[self.viewing_index]
-        word = raw.split("(")[0].strip() if "(" in raw else raw
+        word, _ = self.parsed[self.viewing_index]
         
         # --- HEADER UPDATE ---
         if self.last_index != self.viewing_index:
@@ -519,10 +1182,15 @@ class ReviewApp:
             
             self.lbl_count.config(text=f"Reviewing {self.viewing_index + 1} of {len(self.word_queue)}")
             for v in self.entries.values(): v.delete("1.0", tk.END)
-            self.lbl_img.config(image="", text="Loading...")
+            self.lbl_img.config(image="", text="Loading...", fg="black")
             self.img_frame.config(bg="#ddd")
             self.last_loaded_path = ""
 
+        self._refresh_current()
+
+    def _refresh_current(self):
+        """Draws whatever the cache holds for the current card; called only when it changes."""
+        word = self.parsed[self.viewing_index][0]
         # Use the word currently typed in the box for cache lookups
         lookup_word = self.word_entry.get().strip()
         data = self.cache.get(lookup_word, self.cache.get(word, {}))
@@ -530,40 +1198,34 @@ class ReviewApp:
         # --- TEXT UPDATE ---
         if "definition" in data:
             current_def = self.entries["Definition"].get("1.0", tk.END).strip()
-            if current_def == "" or data.get("force_text_update", False):
+            # Pop first: a flag left behind would overwrite the reviewer's edits on the next refresh
+            force = data.pop("force_text_update", False)
+            if current_def == "" or force:
                 for k, v in self.entries.items():
                     val = data.get(k.lower(), "")
                     if v.get("1.0", tk.END).strip() != val:
                         v.delete("1.0", tk.END)
                         v.insert("1.0", val)
-                if "force_text_update" in data: del data["force_text_update"]
 
-        # --- IMAGE UPDATE (STRICT CHECKS) ---
+        # --- IMAGE UPDATE ---
         current_img_path = data.get("image_path")
         error_msg = data.get("image_error")
-        current_lbl_text = self.lbl_img.cget("text")
 
-        # Case A: Success (New Image)
-        if current_img_path and getattr(self, "last_loaded_path", "") != current_img_path:
+        if current_img_path and self.last_loaded_path != current_img_path:
             self.show_image(current_img_path)
             self.last_loaded_path = current_img_path
             self.lbl_img.config(text="")
             self.img_frame.config(bg="#ddd")
-            
-        # Case B: Error (Only update if NOT already showing error)
         elif error_msg:
-            # Check if we are ALREADY showing this specific error
-            if error_msg not in current_lbl_text:
-                self.lbl_img.config(image="", text=f"⚠️ {error_msg}\n\nChange Mode or Text", fg="red")
-                self.img_frame.config(bg="#ffcccc")
-
-        # Case C: Loading (Only update if NOT already loading)
-        elif not current_img_path and not error_msg:
-             if "Generating" not in current_lbl_text and "Loading" not in current_lbl_text:
-                 self.lbl_img.config(image="", text="Generating...", fg="black")
-                 self.img_frame.config(bg="#ddd")
+            self.lbl_img.config(image="", text=f"⚠️ {error_msg}\n\nChange Mode or Text", fg="red")
+            self.img_frame.config(bg="#ffcccc")
 
-        self.after_id = self.root.after(500, self.load_current_view)
+    def _notify_cache_update(self, word):
+        """Runs on the Tk thread when a worker has new data for `word`."""
+        if self.is_closing or self.viewing_index >= len(self.parsed):
+            return
+        if word in (self.current_word, self.parsed[self.viewing_index][0]):
+            self._refresh_current()
         
     def approve(self):
         if "image_error" in self.cache.get(self.current_word, {}):
@@ -571,67 +1233,83 @@ class ReviewApp:
              return
         
         if "image_path" not in self.cache.get(self.current_word, {}):
+            self._ensure_upcoming()
             messagebox.showwarning("Wait", "Image is still generating!")
             return
 
-        # LOCK UI & STOP REFRESH LOOP
+        # LOCK UI
         self.btn_approve.config(state="disabled", text="Saving...")
-        if self.after_id:
-            self.root.after_cancel(self.after_id)
-            self.after_id = None
 
-        # Pass the current index to the worker to ensure the correct row is updated
-        idx_to_approve = self.viewing_index
-        threading.Thread(target=self._approve_worker, args=(idx_to_approve,)).start()
-        
-    def _approve_worker(self, row_idx_in_queue):
-        # final_sentence = self.entries["Sentence"].get("1.0", tk.END).strip()
-        # safe_name = "".join([c for c in self.current_word if c.isalnum()]) + f"_{int(time.time())}.mp3"
-        final_word = self.word_entry.get().strip() # Use the text currently in the box
-        final_sentence = self.entries["Sentence"].get("1.0", tk.END).strip()
-        safe_name = "".join([c for c in final_word if c.isalnum()]) + f"_{int(time.time())}.mp3"
-        
+        # Snapshot every widget and cache value here on the Tk thread; the worker touches neither
+        entry = self.cache[self.current_word]
+        card = {
+            "word": self.word_entry.get().strip(),  # Use the text currently in the box
+            "definition": self.entries["Definition"].get("1.0", tk.END).strip(),
+            "sentence": self.entries["Sentence"].get("1.0", tk.END).strip(),
+            "translation": self.entries["Translation"].get("1.0", tk.END).strip(),
+            "scenario": self.entries["Scenario"].get("1.0", tk.END).strip(),
+            "image_path": entry["image_path"],
+            "ts": entry.get("ts"),
+            # The current index pins the sheet row, so the correct row is updated
+            "row_id": self.raw_data[self.viewing_index]["row_idx"],
+        }
+        threading.Thread(target=self._approve_worker, args=(card,)).start()
         
-        self.update_status(f"🎤 Generating Audio for '{self.current_word}'...")
-        aud_path = generate_audio_azure(final_sentence, safe_name)
-        aud_name = os.path.basename(aud_path) if aud_path else ""
+    def _approve_worker(self, card):
+        try:
+            self._approve_card(card)
+        except Exception as e:
+            # Unlock Approve so one bad card doesn't block the rest of the session
+            print(f"❌ Approve failed for '{card['word']}': {e}")
+            self._ui(self.btn_approve.config, state="normal", text="✅ APPROVE & NEXT")
+            self._ui(self.toast, f"⚠️ Could not save '{card['word']}': {e}")
+            return
+        self._ui(self._finish_approval)
 
-        img_temp = self.cache[self.current_word]["image_path"]
+    def _approve_card(self, card):
+        final_word = card["word"]
+        final_sentence = card["sentence"]
+        safe_name = make_safe_name(final_word, ".mp3", card["ts"])
+        
+        img_temp = card["image_path"]
         img_name = os.path.basename(img_temp)
         img_final = os.path.join(FINAL_FOLDER, img_name)
         
-        try: shutil.move(img_temp, img_final)
-        except: shutil.copy(img_temp, img_final)
-
+        _move_fast(img_temp, img_final)
+
+        final_scenario = card["scenario"]
+        self.executor.submit(remember_image, final_word, final_scenario, img_final)
+
+        row = [
+            final_word,
+            card["definition"],
+            final_sentence,
+            card["translation"],
+            final_scenario,
+            f'<img src="{img_name}">',
+            "",  # Audio, filled in once synthesis finishes
+        ]
+
+        # Synthesis runs right here on this dedicated thread, so it never queues behind pool work
+        self.update_status(f"🎤 Generating Audio for '{final_word}'...")
+        aud_path = generate_audio_azure(final_sentence, safe_name)
         if aud_path:
+            aud_name = os.path.basename(aud_path)
             aud_final = os.path.join(FINAL_FOLDER, aud_name)
-            try: shutil.move(aud_path, aud_final)
-            except: shutil.copy(aud_path, aud_final)
-
-        row_data = {
-            "Target": final_word,
-            "Definition": self.entries["Definition"].get("1.0", tk.END).strip(),
-            "Sentence": final_sentence,
-            "Translation": self.entries["Translation"].get("1.0", tk.END).strip(),
-            "Scenario": self.entries["Scenario"].get("1.0", tk.END).strip(),
-            "Image": f'<img src="{img_name}">',
-            "Audio": f'[sound:{aud_name}]' if aud_name else ""
-        }
+            _move_fast(aud_path, aud_final)
+            row[6] = f'[sound:{aud_name}]'
         
-        # --- CSV WRITE (COLON SEPARATOR, NO HEADER) ---
-        with open(CSV_FILE, "a", newline="", encoding="utf-8") as f:
-            import csv
-            writer = csv.DictWriter(f, fieldnames=row_data.keys(), delimiter=':')
-            writer.writerow(row_data)
-        
-        row_id = self.raw_data[row_idx_in_queue]["row_idx"]
-        self.sheet_mgr.mark_as_done(row_id)
+        # The CSV thread queues the Done mark once the row is flushed; _shutdown_workers joins
+        # that thread before the final sheet flush, so the mark is always sent
+        self._csv_q.put((row, card["row_id"]))
 
-        print(f"✅ Approved: {self.current_word}")
-        self.root.after(0, self._finish_approval)
+        print(f"✅ Approved: {final_word}")
 
     def _finish_approval(self):
         self.viewing_index += 1
+        self._save_review_cache()
+        self._extend_prefetch()
+        self._ensure_upcoming()
         self.current_word = None
         for v in self.entries.values(): v.delete("1.0", tk.END)
         self.last_loaded_path = ""
@@ -652,11 +1330,11 @@ class ReviewApp:
         self.update_status(f"⏩ Skipping '{self.current_word}'...")
         
         # Update Google Sheets
-        self.sheet_mgr.mark_as_skipped(row_id)
+        self.sheet_mgr.queue_skipped(row_id)
         
         print(f"⏩ Skipped: {self.current_word}")
         # Return to main thread to advance the UI
-        self.root.after(0, self._finish_skip)
+        self._ui(self._finish_skip)
 
     def on_word_edited(self, event=None):
         new_word = self.word_entry.get().strip()
@@ -676,10 +1354,14 @@ class ReviewApp:
             self.cache[new_word]["force_text_update"] = True
             
             self.update_status(f"✏️ Word updated. Image preserved.")
+            self._refresh_current()
             
     def _finish_skip(self):
         self.btn_skip.config(state="normal")
         self.viewing_index += 1
+        self._save_review_cache()
+        self._extend_prefetch()
+        self._ensure_upcoming()
         # Clear entries for next word
         for v in self.entries.values(): v.delete("1.0", tk.END)
         self.last_loaded_path = ""
@@ -705,20 +1387,20 @@ class ReviewApp:
         self.btn_regen_text.config(state="disabled")
         
         # Pass the instruction to the worker
-        threading.Thread(target=self._do_regen_text, args=(word, hint, instruction)).start()
+        asyncio.run_coroutine_threadsafe(self._do_regen_text(word, hint, instruction), self.loop)
 
     # Update the worker signature to accept instruction
-    def _do_regen_text(self, word, hint, instruction):
+    async def _do_regen_text(self, word, hint, instruction):
         # Pass instruction to generation logic
-        data = generate_text_data(word, hint, instruction)
+        data = await agenerate_text_data(word, hint, instruction, use_cache=False)
         
         if data:
             data["force_text_update"] = True 
-            self.cache[word].update(data)
-            self.root.after(0, self._finish_text_regen)
+            self._post_update(word, data)
+            self._ui(self._finish_text_regen)
         else:
-            # Handle failure (optional: re-enable button)
-            self.root.after(0, lambda: self.btn_regen_text.config(state="normal"))
+            self._ui(self.toast, f"❌ Text regeneration for '{word}' failed")
+            self._ui(self.btn_regen_text.config, state="normal")
 
     def _finish_text_regen(self):
         self.update_status("Text updated.")
@@ -733,25 +1415,42 @@ class ReviewApp:
         
         self.btn_regen_img.config(state="disabled")
         self.btn_regen_text.config(state="disabled")
-        threading.Thread(target=self._do_regen_image, args=(word, scenario)).start()
+        self.cache[word].pop("image_error", None)
+        self._regenerating.add(word)
+        # The old file is about to be deleted, so Approve must wait for the replacement
+        old_path = self.cache[word].pop("image_path", None)
+        asyncio.run_coroutine_threadsafe(self._do_regen_image(word, scenario, old_path), self.loop)
 
-    def _do_regen_image(self, word, scenario):
-        if "image_error" in self.cache[word]: del self.cache[word]["image_error"]
-        old_path = self.cache[word].get("image_path")
+    async def _do_regen_image(self, word, scenario, old_path):
         if old_path and os.path.exists(old_path):
             try: os.remove(old_path)
             except: pass
         
-        safe_name = "".join([c for c in word if c.isalnum()]) + f"_{int(time.time())}.png"
-        path, error = generate_image(scenario, safe_name, "fal")
-        self.root.after(0, lambda: self.finish_regen(path, error, word))
-
-    def finish_regen(self, path, error, word):
-        if path:
-            self.cache[word]["image_path"] = path
-            self.show_image(path)
-            self.last_loaded_path = path
-            self.update_status("Regeneration complete.")
+        ts = int(time.time())
+        # Candidates run concurrently, so offering a choice costs one image call of wall time
+        results = await asyncio.gather(*[
+            agenerate_image(scenario, make_safe_name(word, f"_{i + 1}.png", ts), "fal")
+            for i in range(REGEN_CANDIDATES)
+        ])
+        paths = [path for path, _ in results if path]
+        error = next((err for _, err in results if err), None)
+        thumbs = None
+        if len(paths) > 1:
+            try: thumbs = await asyncio.to_thread(lambda: [load_thumbnail(p, PICKER_THUMB_SIZE) for p in paths])
+            except Exception: thumbs = None
+        self._ui(self.finish_regen, paths, error, word, ts, thumbs)
+
+    def finish_regen(self, paths, error, word, ts=None, thumbs=None):
+        if paths and thumbs:
+            # Buttons come back once the reviewer has picked a candidate
+            self._pick_regen(paths, thumbs, word, ts)
+            return
+        self._regenerating.discard(word)
+        if paths:
+            for extra in paths[1:]:
+                try: os.remove(extra)
+                except OSError: pass
+            self._use_regen_image(word, paths[0], ts)
         elif error:
             self.cache[word]["image_error"] = error
             self.lbl_img.config(text=f"⚠️ {error}\nChange Text & Retry", fg="red")
@@ -761,25 +1460,190 @@ class ReviewApp:
         self.btn_regen_img.config(state="normal")
         self.btn_regen_text.config(state="normal")
 
-    def show_image(self, path):
+    def _pick_regen(self, paths, thumbs, word, ts):
+        """Shows the regenerated candidates side by side; clicking one keeps it and deletes the rest."""
+        win = tk.Toplevel(self.root)
+        win.title(f"Pick an image for '{word}'")
+        win.transient(self.root)
+        win.renders = [ImageTk.PhotoImage(t) for t in thumbs]  # Tk drops images nothing references
+
+        def choose(i):
+            win.destroy()
+            for j, p in enumerate(paths):
+                if j != i:
+                    try: os.remove(p)
+                    except OSError: pass
+            self._regenerating.discard(word)
+            self._use_regen_image(word, paths[i], ts)
+            self.btn_regen_img.config(state="normal")
+            self.btn_regen_text.config(state="normal")
+
+        for i, render in enumerate(win.renders):
+            tk.Button(win, image=render, command=lambda i=i: choose(i)).pack(side="left", padx=5, pady=5)
+        # Closing the picker keeps the first candidate
+        win.protocol("WM_DELETE_WINDOW", lambda: choose(0))
+        # Modal: the card has no image until a candidate is chosen. X11 refuses a grab on an
+        # unmapped window, and a failed grab must not cost the reviewer a working picker
         try:
-            load = Image.open(path)
-            aspect = load.width / load.height
-            new_w = 450
-            new_h = int(new_w / aspect)
-            load = load.resize((new_w, new_h), Image.Resampling.LANCZOS)
-            render = ImageTk.PhotoImage(load)
+            win.wait_visibility()
+            win.grab_set()
+        except tk.TclError:
+            pass
+
+    def _use_regen_image(self, word, path, ts):
+        self.cache[word]["image_path"] = path
+        self.cache[word]["ts"] = ts
+        if word == self.current_word:
+            self.show_image(path)
+            self.last_loaded_path = path
+        self.update_status("Regeneration complete.")
+
+    def show_image(self, path):
+        render = self._photo_cache.get((path, THUMB_SIZE))
+        if render is not None:
             self.lbl_img.config(image=render)
             self.lbl_img.image = render
-        except: pass
+            return
+        # Decode + resize on a worker; the Tk thread only wraps the finished thumbnail
+        self.executor.submit(self._decode_image, path)
+
+    def _decode_image(self, path):
+        try: load = load_thumbnail(path)
+        except: return
+        self._ui(self._attach_photo, load, path)
+
+    def _attach_photo(self, img, path):
+        # Drop results for a card the reviewer already moved past
+        if self.is_closing or path != self.last_loaded_path:
+            return
+        render = ImageTk.PhotoImage(img)
+        self._photo_cache.put((path, THUMB_SIZE), render)
+        self.lbl_img.config(image=render)
+        self.lbl_img.image = render
+
+    def toast(self, msg):
+        """Briefly shows msg over the bottom of the window (Tk thread; workers go through _ui)."""
+        lbl = tk.Label(self.root, text=msg, bg="#333", fg="white", padx=12, pady=6)
+        lbl.place(relx=0.5, rely=0.95, anchor="s")
+        self.root.after(TOAST_MS, lbl.destroy)
+
+    def _ui(self, fn, *args, **kwargs):
+        """Queues fn to run on the Tk thread; safe to call from any thread."""
+        self.ui_queue.put((fn, args, kwargs))
 
     def update_status(self, msg):
-        self.root.after(0, lambda: self.lbl_status.config(text=msg))
+        self.ui_queue.put((None, msg, None))
+
+    def _drain_ui(self):
+        """Runs every queued UI callback on the Tk thread, once per UI_POLL_MS."""
+        if self.is_closing: return
+        status = None
+        try:
+            while True:
+                fn, args, kwargs = self.ui_queue.get_nowait()
+                if fn is None:
+                    status = args  # Only the newest status message is worth drawing
+                    continue
+                try: fn(*args, **kwargs)
+                except Exception as e: print(f"⚠️ UI update failed: {e}")
+                if self.is_closing: return
+        except queue.Empty:
+            pass
+        if status is not None:
+            self.lbl_status.config(text=status)
+        self.root.after(UI_POLL_MS, self._drain_ui)
+
+# --- 6. OFFLINE BATCH MODE ---
+BATCH_POLL_SECONDS = 60
+# Pre-rendered images stay out of Anki's media folder: the GUI copies a hit to temp and
+# only the approved copy reaches collection.media, so skipped words leave nothing behind
+PRERENDER_FOLDER = os.path.join(CACHE_FOLDER, "prerendered")
+
+async def _write_all_cards(items):
+    cards = []
+    for i in range(0, len(items), TEXT_BATCH_SIZE):
+        cards += await agenerate_text_batch(items[i:i + TEXT_BATCH_SIZE])
+    for i, card in enumerate(cards):
+        if not card: cards[i] = await agenerate_text_data(*items[i])
+    return cards
+
+def run_batch_mode(sheet_mgr):
+    """
+    Pre-renders every pending word for tomorrow's review session.
+    Text goes through the usual Gemini cache; images go through OpenAI's Batch API
+    (half price, up to 24h turnaround) and are indexed in the image cache, so the
+    GUI picks them up instead of generating new ones.
+    """
+    items = [parse_entry(row["text"]) for row in sheet_mgr.fetch_pending_words(headless=True)]
+    if not items:
+        print("No pending words found!")
+        return
+
+    print(f"📝 Writing text for {len(items)} words...")
+    cards = asyncio.run(_write_all_cards(items))
+
+    mode = CFG["generation"].get("image_mode", "standard").lower()
+    jobs = {}
+    batch_file = os.path.join(CACHE_FOLDER, "image_batch.jsonl")
+    os.makedirs(PRERENDER_FOLDER, exist_ok=True)
+    with open(batch_file, "w", encoding="utf-8") as f:
+        for i, ((word, _), card) in enumerate(zip(items, cards)):
+            if not card or not card.get("scenario"):
+                continue
+            if mode == "mini":
+                body = {"model": "gpt-image-1-mini", "prompt": dalle_prompt(card["scenario"]), "quality": IMG_QUALITY, "n": 1}
+            else:
+                body = {"model": "dall-e-3", "prompt": dalle_prompt(card["scenario"]), "size": "1024x1024",
+                        "quality": "standard", "n": 1, "response_format": "b64_json"}
+            jobs[str(i)] = (word, card["scenario"])
+            f.write(json.dumps({"custom_id": str(i), "method": "POST", "url": "/v1/images/generations", "body": body}) + "\n")
+    if not jobs:
+        print("No scenarios to render.")
+        return
+
+    with open(batch_file, "rb") as f:
+        uploaded = openai_client.files.create(file=f, purpose="batch")
+    batch = openai_client.batches.create(
+        input_file_id=uploaded.id,
+        endpoint="/v1/images/generations",
+        completion_window="24h"
+    )
+    print(f"🚀 Submitted batch {batch.id} with {len(jobs)} images. Waiting for completion...")
+
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        time.sleep(BATCH_POLL_SECONDS)
+        batch = openai_client.batches.retrieve(batch.id)
+        print(f"⏳ Batch {batch.id}: {batch.status}")
+
+    if batch.status != "completed" or not batch.output_file_id:
+        print(f"❌ Batch ended with status '{batch.status}'")
+        return
+
+    saved = 0
+    output = openai_client.files.content(batch.output_file_id).text
+    for line in output.splitlines():
+        result = json.loads(line)
+        word, scenario = jobs.get(result.get("custom_id"), (None, None))
+        response = result.get("response") or {}
+        if not word or response.get("status_code") != 200:
+            continue
+        b64 = response["body"]["data"][0].get("b64_json")
+        if not b64:
+            continue
+        path = os.path.join(PRERENDER_FOLDER, make_safe_name(word, ".png"))
+        write_b64(path, b64)
+        remember_image(word, scenario, path)
+        saved += 1
+    print(f"✅ Pre-rendered {saved} of {len(jobs)} images into {PRERENDER_FOLDER}")
+
 
 if __name__ == "__main__":
     if not os.path.exists("credentials.json"):
         print("⚠️ Config not found. Using internal defaults.")
-    root = tk.Tk()
     sheet_mgr = SheetManager(sheet_name=SHEET_NAME)
-    app = ReviewApp(root, sheet_mgr)
-    root.mainloop()
\ No newline at end of file
+    if "--batch" in sys.argv:
+        run_batch_mode(sheet_mgr)
+    else:
+        root = tk.Tk()
+        app = ReviewApp(root, sheet_mgr)
+        root.mainloop()
\ No newline at end of file
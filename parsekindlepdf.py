@@ -1,6 +1,7 @@
 import os
 import re
 import json
+import orjson
 import time
 from google import genai
 import gspread
@@ -11,31 +12,51 @@ GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 SPREADSHEET_NAME = "Anki Staging"
 INPUT_FILE_NAME = "to_stg.txt"  
 
+# Noise lines from Kindle exports, combined into one pattern:
+# Matches "", "Page 10 | Highlight", "kindle", or standalone numbers
+_NOISE_RE = re.compile("|".join(f"(?:{p})" for p in [
+    r"^\\",                       # Source tags
+    r"^Page\s+\d+\s*\|\s*Highlight", # Kindle header
+    r"^kindle\s*$",                 # Kindle footer
+    r"^\d+$",                       # Standalone page numbers
+    r"^--- PAGE \d+ ---",           # Page delimiters
+]), re.IGNORECASE)
+_TAG_RE = re.compile(r"\\")
+
 # --- SETUP GEMINI ---
 google_client = genai.Client(api_key=GOOGLE_API_KEY)
 
+# --- SETUP SHEETS (authorized lazily, once per process) ---
+_sheet = None
+
 # --- FUNCTIONS ---
 
-def clean_text(file_path):
+def iter_json_items(text):
     """
-    Parses the raw text file and extracts only the user's bookmarked words.
-    Removes page numbers, metadata headers, source tags, and blank lines.
+    Yields the objects of a top-level JSON array one at a time.
+    Stops at the first malformed item, so a truncated response still returns what came before it.
     """
-    cleaned_items = []
-    
-    # Regex patterns to identify noise
-    # Matches "", "Page 10 | Highlight", "kindle", or standalone numbers
-    patterns_to_remove = [
-        r"^\\",      # Source tags
-        r"^Page\s+\d+\s*\|\s*Highlight", # Kindle header
-        r"^kindle\s*$",             # Kindle footer
-        r"^\d+$",                   # Standalone page numbers
-        r"^--- PAGE \d+ ---"        # Page delimiters
-    ]
-    
-    with open(file_path, "r", encoding="utf-8") as f:
-        lines = f.readlines()
+    decoder = json.JSONDecoder()
+    i = text.find("[") + 1
+    if i == 0:
+        return
+    n = len(text)
+    while True:
+        while i < n and text[i] in " \t\r\n,":
+            i += 1
+        if i >= n or text[i] == "]":
+            return
+        try:
+            item, i = decoder.raw_decode(text, i)
+        except json.JSONDecodeError as e:
+            print(f"Stopped parsing Gemini output early: {e}")
+            return
+        yield item
 
+def _iter_clean_lines(lines):
+    """
+    Yields the cleaned, non-noise lines one at a time.
+    """
     for line in lines:
         line = line.strip()
         
@@ -44,27 +65,29 @@ def clean_text(file_path):
             continue
             
         # 2. Check against noise patterns
-        is_noise = False
-        for pattern in patterns_to_remove:
-            if re.search(pattern, line, re.IGNORECASE):
-                is_noise = True
-                break
-        
-        if is_noise:
+        if _NOISE_RE.search(line):
             continue
             
         # 3. Clean specific artifacts from the line itself (if mixed)
         # Sometimes source tags might be on the same line as text in copy-pastes
-        line = re.sub(r"\\", "", line).strip()
+        line = _TAG_RE.sub("", line).strip()
         
         # 4. Final filter: If line is very short or looks like just punctuation/symbols
         if len(line) < 2 and not line.isalpha():
             continue
             
-        cleaned_items.append(line)
+        yield line
 
-    # Remove duplicates while preserving order
-    return list(dict.fromkeys(cleaned_items))
+def clean_text(file_path):
+    """
+    Parses the raw text file and extracts only the user's bookmarked words.
+    Removes page numbers, metadata headers, source tags, and blank lines.
+    """
+    # Lines stream straight from the file into the dedup; nothing else is held in memory
+    seen = set()
+    with open(file_path, "r", encoding="utf-8") as f:
+        # Remove duplicates while preserving order
+        return [line for line in _iter_clean_lines(f) if not (line in seen or seen.add(line))]
 
 def analyze_with_gemini(word_list):
     """
@@ -101,30 +124,48 @@ def analyze_with_gemini(word_list):
     """
 
     try:
-        response = google_client.models.generate_content(
+        # Stream the reply into a list of chunks (joined once at the end, not concatenated per chunk)
+        chunks = []
+        for chunk in google_client.models.generate_content_stream(
             model="gemini-2.5-pro",
             contents=prompt,
             config={
                 "response_mime_type": "application/json" 
             }
-        )
-        clean_response = response.text.replace("```json", "").replace("```", "").strip()
-        return json.loads(clean_response)
+        ):
+            if chunk.text:
+                chunks.append(chunk.text)
+        text = "".join(chunks)
+        # response_mime_type normally rules out fences; only copy the text when one is there
+        if "```" in text:
+            text = text.replace("```json", "").replace("```", "")
+        try:
+            # Complete replies parse in one orjson pass; the item walk only salvages broken ones
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            return list(iter_json_items(text))
     except Exception as e:
         print(f"Error calling Gemini: {e}")
         return []
 
+def get_sheet():
+    """
+    Returns the target worksheet, authorizing and opening it only on the first call.
+    """
+    global _sheet
+    if _sheet is None:
+        print("Connecting to Google Sheets...")
+        scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+        creds = ServiceAccountCredentials.from_json_keyfile_name("credentials.json", scope)
+        _sheet = gspread.authorize(creds).open(SPREADSHEET_NAME).sheet1
+    return _sheet
+
 def save_to_sheets(data):
     """
     Appends the processed data to the Google Sheet.
     """
-    print("Connecting to Google Sheets...")
-    scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-    creds = ServiceAccountCredentials.from_json_keyfile_name("credentials.json", scope)
-    client = gspread.authorize(creds)
-    
     try:
-        sheet = client.open(SPREADSHEET_NAME).sheet1
+        sheet = get_sheet()
         
         # Prepare rows: [Word, Meaning]
         rows_to_add = []